@@ -3,12 +3,35 @@ Module contenant la classe Boid pour la simulation de boids.
 """
 
 from __future__ import annotations
+import math
 from typing import TypeAlias, Callable
 import numpy as np
 
 # Type pour les fonctions d'interaction
 funInteraction: TypeAlias = Callable[["Boid", list["Boid"]], float]
 
+# cos(0.75 * pi) : seuil de l'angle mort (arccos est décroissante, donc
+# "angle > 0.75π" équivaut à "cos(angle) < cos(0.75π)")
+ANGLE_MORT_COS = math.cos(0.75 * math.pi)
+
+# Vecteur nul partagé, renvoyé par les forces sans voisin : évite une
+# allocation np.zeros(2) par appel (lecture seule, les appelants ne le
+# modifient jamais en place)
+_ZERO2 = np.zeros(2)
+_ZERO2.flags.writeable = False
+
+# Générateur par défaut du module (PCG64) : utilisé quand aucun
+# générateur n'est fourni, sans passer par l'API globale héritée
+_RNG = np.random.default_rng()
+
+# Constantes du module : un LOAD_GLOBAL (ou un LOAD_FAST une fois liées
+# en locales) au lieu d'un LOAD_ATTR sur la classe dans les parties
+# chaudes ; les attributs de classe restent comme alias publics
+TAILLE = 300  # taille du cadre
+MAX_VOISINS = 10  # nombre de voisins à considérer
+MAX_VITESSE = 10  # vitesse maximale
+MAX_BOOST = 3.0  # valeur maximale du boost
+
 class Boid:
     """
     Classe représentant un boid dans la simulation.
@@ -16,27 +39,35 @@ class Boid:
     d'interaction avec les autres boids.
     """
 
-    # Attributs de classe
-    taille: int = 300  # taille du cadre
-    max_voisins: int = 10  # nombre de voisins à considérer
-    maXVitesse: int = 10  # vitesse maximale
-    maxBoostValue: float = 3  # valeur maximale du boost
+    # Jeu d'attributs d'instance fixe : pas de __dict__ par boid,
+    # l'accès aux attributs est plus rapide et l'empreinte plus petite
+    __slots__ = ("x", "dx", "interactions", "boost", "boostValue")
+
+    # Attributs de classe (alias des constantes du module)
+    taille: int = TAILLE
+    max_voisins: int = MAX_VOISINS
+    maXVitesse: int = MAX_VITESSE
+    maxBoostValue: float = MAX_BOOST
 
-    def __init__(self: Boid, position=None, vitesse=None) -> None:
+    def __init__(self: Boid, position=None, vitesse=None, rng=None) -> None:
         """
         Initialise un nouveau boid.
-        
+
         Args:
             position: position initiale (aléatoire si None)
             vitesse: vitesse initiale (aléatoire si None)
+            rng: générateur np.random.Generator pour les tirages
+                (générateur du module si None)
         """
+        if rng is None:
+            rng = _RNG
         self.x = (
             position
             if position is not None
-            else np.random.uniform(-Boid.taille, Boid.taille, 2)
+            else rng.uniform(-TAILLE, TAILLE, 2)
         )
         self.dx = (
-            vitesse if vitesse is not None else np.random.uniform(-5, 5, 2)
+            vitesse if vitesse is not None else rng.uniform(-5, 5, 2)
         )
         # Liste des fonctions d'interaction non incluse dans la classe et le poids associé
         self.interactions: list[tuple[funInteraction, float]] = []
@@ -44,12 +75,7 @@ class Boid:
         # Permet de savoir si le boid est sous l'effet d'un boost
         self.boost: bool = False
         # Initialise la puissance du boost
-        self.boostValue: float = Boid.maxBoostValue
-        
-        # Cache pour stocker les voisins calculés
-        self._voisins_cache = {}
-        # Cache pour stocker les distances calculées
-        self._distances_cache = {}
+        self.boostValue: float = MAX_BOOST
 
     def add_interaction(self: Boid, fun: funInteraction, poids: float) -> None:
         """
@@ -69,7 +95,8 @@ class Boid:
     @property
     def vitesse(self: Boid) -> float:
         """Calcule la norme du vecteur vitesse."""
-        return np.linalg.norm(self.dx)
+        # math.hypot : bien plus rapide que np.linalg.norm sur 2 scalaires
+        return math.hypot(self.dx[0], self.dx[1])
 
     @vitesse.setter
     def vitesse(self: Boid, value: float) -> None:
@@ -91,11 +118,9 @@ class Boid:
         Returns:
             float: distance entre les deux boids
         """
-        # Utiliser un cache pour éviter de recalculer les distances
-        cache_key = (id(self), id(other))
-        if cache_key not in self._distances_cache:
-            self._distances_cache[cache_key] = np.linalg.norm(self.x - other.x)
-        return self._distances_cache[cache_key]
+        # math.hypot évite le coût de dispatch de np.linalg.norm
+        # sur un vecteur à 2 éléments
+        return math.hypot(self.x[0] - other.x[0], self.x[1] - other.x[1])
 
     def angle_mort(self: Boid, other: Boid) -> bool:
         """
@@ -107,21 +132,22 @@ class Boid:
         Returns:
             bool: True si l'autre boid est dans l'angle mort
         """
-        # Optimisation: éviter de recalculer les vecteurs
-        v1 = self.dx  # Pas besoin de soustraire self.x car dx est déjà un vecteur
+        # dx est déjà un vecteur, pas besoin de soustraire self.x
+        v1 = self.dx
         v2 = other.x - self.x  # Vecteur de self vers other
-        
-        # Éviter de calculer les normes si possible
-        norm_v1 = np.linalg.norm(v1)
-        norm_v2 = np.linalg.norm(v2)
-        
-        if norm_v1 == 0 or norm_v2 == 0:
+
+        # Comparaison de cosinus sans arccos ni racines : l'autre boid est
+        # dans l'angle mort si cos(angle) < cos(0.75π), soit, en travaillant
+        # sur les normes au carré et en gérant le signe :
+        # dot < 0 et dot² > cos²(0.75π) · |v1|² · |v2|²
+        dot = v1[0] * v2[0] + v1[1] * v2[1]
+        if dot >= 0:
             return False
-            
-        cos_angle = np.dot(v1, v2) / (norm_v1 * norm_v2)
-        # Assurer que cos_angle est dans [-1, 1] pour éviter des erreurs numériques
-        cos_angle = max(-1.0, min(1.0, cos_angle))
-        return np.arccos(cos_angle) > 0.75 * np.pi
+        n1sq = v1[0] * v1[0] + v1[1] * v1[1]
+        n2sq = v2[0] * v2[0] + v2[1] * v2[1]
+        if n1sq == 0 or n2sq == 0:
+            return False
+        return dot * dot > ANGLE_MORT_COS * ANGLE_MORT_COS * n1sq * n2sq
 
     def voisins(self: Boid, population: list[Boid], seuil: float) -> list[Boid]:
         """
@@ -134,154 +160,200 @@ class Boid:
         Returns:
             list[Boid]: liste des voisins triés par distance
         """
-        # Utiliser un cache pour éviter de recalculer les voisins
-        cache_key = (id(population), seuil)
-        if cache_key in self._voisins_cache:
-            return self._voisins_cache[cache_key]
-            
-        # Réinitialiser le cache des distances pour ce nouveau calcul
-        self._distances_cache = {}
-        
-        # Calculer les voisins
-        result = sorted(
+        return [
+            other for _, other in self._neighbors_with_dist(population, seuil)
+        ]
+
+    def _neighbors_with_dist(
+        self: Boid, population: list[Boid], seuil: float
+    ) -> list[tuple[float, Boid]]:
+        """
+        Renvoie les couples (distance, voisin) visibles, triés par distance.
+
+        Un seul balayage de la population suffit ainsi par image : les
+        forces filtrent ensuite cette liste par rayon au lieu de rebalayer.
+
+        Args:
+            population: liste de tous les boids
+            seuil: distance maximale pour considérer un boid comme voisin
+
+        Returns:
+            list[tuple[float, Boid]]: couples (distance, voisin) triés
+        """
+        return sorted(
             (
-                other
+                (d, other)
                 for other in population
                 if self is not other
-                and self.distance(other) < seuil
+                and (d := self.distance(other)) < seuil
                 and not self.angle_mort(other)
             ),
-            key=self.distance,
+            key=lambda couple: couple[0],
         )
-        
-        # Stocker dans le cache
-        self._voisins_cache[cache_key] = result
-        return result
 
-    def separation(self, population: list[Boid]):
+    def _accum_forces(
+        self: Boid, candidats: list[tuple[float, Boid]]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Accumule séparation, alignement et cohésion en un seul parcours.
+
+        La liste candidats étant triée par distance, un seul passage
+        suffit pour remplir les deux voisinages (rayon 50 pour la
+        séparation, rayon 200 pour l'alignement et la cohésion), au lieu
+        de re-parcourir et re-trancher la liste pour chaque force.
+
+        Args:
+            candidats: couples (distance, voisin) triés par distance
+
+        Returns:
+            tuple: vecteurs (séparation, alignement, cohésion)
+        """
+        max_voisins = MAX_VOISINS
+        proches_x: list[np.ndarray] = []
+        vois_x: list[np.ndarray] = []
+        vois_dx: list[np.ndarray] = []
+
+        for d, other in candidats:
+            plein_vois = len(vois_x) >= max_voisins
+            plein_sep = d >= 50 or len(proches_x) >= max_voisins
+            if plein_vois and plein_sep:
+                break
+            if not plein_vois:
+                vois_x.append(other.x)
+                vois_dx.append(other.dx)
+            if not plein_sep:
+                proches_x.append(other.x)
+
+        if proches_x:
+            sep = self.x * len(proches_x) - np.stack(proches_x).sum(axis=0)
+        else:
+            sep = _ZERO2
+        if vois_x:
+            ali = np.stack(vois_dx).mean(axis=0) - self.dx
+            coh = np.stack(vois_x).mean(axis=0) - self.x
+        else:
+            ali = _ZERO2
+            coh = _ZERO2
+        return sep, ali, coh
+
+    def separation(self, voisins: list[Boid]):
         """
         Calcule la composante de la force qui éloigne les boids les uns des autres.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            voisins: voisins proches déjà filtrés (rayon 50)
+
         Returns:
             np.ndarray: vecteur de séparation
         """
-        voisins_proches = self.voisins(population, 50)[: Boid.max_voisins]
-        if not voisins_proches:
-            return np.zeros(2)
-            
-        return sum(
-            self.x - other.x
-            for other in voisins_proches
-        )
+        if not voisins:
+            return _ZERO2
+
+        # Une seule réduction C sur un tableau (k, 2) au lieu de k
+        # additions Python de petits vecteurs
+        positions = np.stack([other.x for other in voisins])
+        return self.x * len(voisins) - positions.sum(axis=0)
 
-    def align(self, population: list[Boid]):
+    def align(self, voisins: list[Boid]):
         """
         Calcule la composante de la force qui aligne les boids les uns avec les autres.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            voisins: voisins visibles déjà filtrés (rayon 200)
+
         Returns:
             np.ndarray: vecteur d'alignement
         """
-        voisins = self.voisins(population, 200)[: Boid.max_voisins]
         if not voisins:
-            return np.zeros(2)
-            
-        vitesses = sum(other.dx for other in voisins)
-        return vitesses / len(voisins) - self.dx
+            return _ZERO2
 
-    def cohere(self: Boid, population: list[Boid]):
+        vitesses = np.stack([other.dx for other in voisins])
+        return vitesses.mean(axis=0) - self.dx
+
+    def cohere(self: Boid, voisins: list[Boid]):
         """
         Calcule la composante de la force qui rapproche les boids les uns des autres.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            voisins: voisins visibles déjà filtrés (rayon 200)
+
         Returns:
             np.ndarray: vecteur de cohésion
         """
-        voisins = self.voisins(population, 200)[: Boid.max_voisins]
         if not voisins:
-            return np.zeros(2)
-            
-        positions = sum(other.x for other in voisins)
-        return positions / len(voisins) - self.x
+            return _ZERO2
 
-    def detect_predator(self: Boid, population: list[Boid]) -> bool:
-        """
-        Détecte si un predaboid est à proximité.
-        
-        Args:
-            population: liste de tous les boids
-            
-        Returns:
-            bool: True si un predaboid est détecté, False sinon
-        """
-        # Vérifier si un Predaboid est dans la population
-        for other in population:
-            # Utiliser le nom de la classe au lieu de isinstance pour éviter la référence circulaire
-            if other.__class__.__name__ == "Predaboid" and self.distance(other) < 150 and not self.angle_mort(other):
-                return True
-        return False
-        
-    def flee_predator(self: Boid, population: list[Boid]):
+        positions = np.stack([other.x for other in voisins])
+        return positions.mean(axis=0) - self.x
+
+    def flee_predator(self: Boid, predateur: tuple[Boid, float] | None):
         """
         Calcule une force de répulsion par rapport au predaboid.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            predateur: couple (predaboid, distance) ou None si aucun
+                predaboid visible à moins de 250
+
         Returns:
             np.ndarray: vecteur de répulsion
         """
-        # Chercher le predaboid dans la population
-        for other in population:
-            if other.__class__.__name__ == "Predaboid" and not self.angle_mort(other):
-                # Calculer la distance au predaboid
-                dist = self.distance(other)
-                if dist < 250:  # Distance de détection du prédateur augmentée
-                    # Force de répulsion inversement proportionnelle à la distance
-                    # Plus le prédateur est proche, plus la force est grande
-                    force = 400 / max(dist, 10)  # Force augmentée et éviter division par zéro
-                    # Vecteur de direction opposée au prédateur
-                    direction = self.x - other.x
-                    # Normaliser le vecteur direction
-                    norm = np.linalg.norm(direction)
-                    if norm > 0:
-                        direction = direction / norm
-                    return direction * force
-        return np.zeros(2)
-
-    def interaction(self: Boid, population: list[Boid]) -> "Boid":
+        if predateur is None:
+            return _ZERO2
+        other, dist = predateur
+        if dist <= 0.0:
+            return _ZERO2
+        # Force 400/max(d,10) portée par la direction normalisée Δ/d,
+        # fusionnées en un seul coefficient : (Δ/d) · 400/max(d,10)
+        # = Δ · 400/(d · max(d,10)). La distance est déjà connue, plus
+        # aucune racine intermédiaire ; en dessous de 10 la norme reste
+        # plafonnée à 40 comme à l'origine
+        coeff = 400.0 / (dist * max(dist, 10.0))
+        return np.array([
+            (self.x[0] - other.x[0]) * coeff,
+            (self.x[1] - other.x[1]) * coeff,
+        ])
+
+    def interaction(
+        self: Boid, population: list[Boid], predator: Boid | None = None
+    ) -> "Boid":
         """
         Déplace le boid en fonction de toutes les forces qui s'y appliquent.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            population: liste des boids normaux (sans le prédateur)
+            predator: le predaboid, passé explicitement plutôt que noyé
+                dans la population (évite de le chercher par balayage)
+
         Returns:
             Boid: le boid lui-même après déplacement
         """
-        # Réinitialiser les caches à chaque itération
-        self._voisins_cache = {}
-        
-        # Optimisation: calculer les voisins une seule fois pour les différentes distances
-        voisins_proches = len(self.voisins(population, 25))
-        
+        # Attributs de classe liés en locales : évite les LOAD_ATTR
+        # répétés dans la partie chaude
+        max_vitesse = MAX_VITESSE
+        taille = TAILLE
+
+        # Un seul balayage de la population au rayon maximal (200), puis
+        # un seul parcours des candidats pour les trois forces
+        candidats = self._neighbors_with_dist(population, 200)
+        sep, ali, coh = self._accum_forces(candidats)
+
+        # Le prédateur est connu à l'appel : un seul test de distance
+        predateur = None
+        if predator is not None and not self.angle_mort(predator):
+            dist = self.distance(predator)
+            if dist < 250:  # portée de fuite
+                predateur = (predator, dist)
+
         # Calculer les forces
         self.dx += (  # avec des pondérations respectives
-            self.separation(population) / 50
-            + self.align(population) / 8
-            + self.cohere(population) / 100
-            + self.flee_predator(population) / 2  # Augmenter l'importance de la fuite du prédateur
+            sep / 50
+            + ali / 8
+            + coh / 100
+            + self.flee_predator(predateur) / 2  # Augmenter l'importance de la fuite du prédateur
         )
 
         # active ou non le boost uniquement si un predaboid est détecté
-        if self.detect_predator(population) and self.boostValue > 1:
+        if predateur is not None and predateur[1] < 150 and self.boostValue > 1:
             self.boost = True
         else:
             self.boost = False
@@ -290,31 +362,37 @@ class Boid:
         for fun, poids in self.interactions:
             self.dx += fun(self, population) / poids
 
-        # limite de la vitesse
-        vitesse_actuelle = self.vitesse
-        if vitesse_actuelle > Boid.maXVitesse:
-            self.dx = self.dx * Boid.maXVitesse / vitesse_actuelle
+        # limite de la vitesse : test sur le carré de la norme, la racine
+        # n'est calculée que si la limite est dépassée
+        v2 = self.dx[0] * self.dx[0] + self.dx[1] * self.dx[1]
+        if v2 > max_vitesse * max_vitesse:
+            self.dx = self.dx * (max_vitesse / math.sqrt(v2))
 
         # On avance
         self.move()
 
-        # On veille à rester dans le cadre par effet rebond
-        if (np.abs(self.x) > Boid.taille).any():
-            for i, coord in enumerate(self.x):
-                if (diff := coord + Boid.taille) < 10:
-                    self.x[i] = -Boid.taille + 10 + diff
-                    self.dx[i] *= -1
-                if (diff := Boid.taille - coord) < 10:
-                    self.x[i] = Boid.taille - 10 - diff
-                    self.dx[i] *= -1
+        # On veille à rester dans le cadre par effet rebond : réflexion
+        # de la vitesse et de la position en une passe vectorielle, comme
+        # dans la version par lots, sans boucle Python par coordonnée
+        marge = taille - 10
+        dehors = np.abs(self.x) > marge
+        if dehors.any():
+            np.negative(self.dx, where=dehors, out=self.dx)
+            np.copyto(
+                self.x,
+                np.clip(2 * np.sign(self.x) * marge - self.x, -marge, marge),
+                where=dehors,
+            )
 
         return self
-    
+
     def move(self : Boid) -> None:
         """
         Déplace le boid en fonction de sa vitesse et de son boost.
         """
-        if self.boost: 
+        max_boost = MAX_BOOST
+
+        if self.boost:
             self.x += self.dx * self.boostValue
 
             self.boostValue -= 0.5
@@ -323,14 +401,14 @@ class Boid:
                 self.boostValue = 0
                 self.boost = False
 
-        else: 
+        else:
             self.x += self.dx * self.boostValue
 
-            if self.boostValue <= Boid.maxBoostValue: 
+            if self.boostValue <= max_boost:
                 self.boostValue += 0.01
 
-                if self.boostValue >= Boid.maxBoostValue: 
-                    self.boostValue = Boid.maxBoostValue
+                if self.boostValue >= max_boost:
+                    self.boostValue = max_boost
 
 
 # Fonctions d'interaction externes
@@ -344,7 +422,7 @@ def centrifuge(self: Boid, population: list[Boid]):
 
 def noise(self: Boid, population: list[Boid]):
     """Un peu de comportement aléatoire."""
-    return np.random.uniform(-5, 5, 2)
+    return _RNG.uniform(-5, 5, 2)
 
 def buildBoidCentripete() -> Boid:
     """
@@ -0,0 +1,136 @@
+"""
+Noyau numérique Numba pour le calcul des forces de la simulation.
+
+Le noyau fusionne séparation, alignement, cohésion et fuite du prédateur
+en un seul parcours des cellules voisines de la grille (aplatie au format
+CSR : ``cell_start`` + ``boid_ids``), parallélisé sur les boids avec
+``prange``. L'angle mort est testé par comparaison de cosinus (produit
+scalaire et normes au carré), sans appel à ``arccos``.
+"""
+
+from __future__ import annotations
+import math
+import numpy as np
+from numba import njit, prange
+
+# cos(0.75 * pi) : seuil de l'angle mort
+ANGLE_MORT_COS = math.cos(0.75 * math.pi)
+_ANGLE_MORT_COS2 = ANGLE_MORT_COS * ANGLE_MORT_COS
+
+# Nombre de voisins à considérer (Boid.max_voisins)
+MAX_VOISINS = 10
+
+@njit(cache=True, fastmath=True, parallel=True)
+def compute_forces(pos, vel, cell_start, boid_ids, cells, ncells_axe,
+                   pred_x, pred_y, out_dv):  # pragma: no cover - compilé
+    """
+    Remplit out_dv avec la variation de vitesse de chaque boid.
+
+    Args:
+        pos: positions (N, 2)
+        vel: vitesses (N, 2)
+        cell_start: débuts de cellules dans boid_ids (format CSR)
+        boid_ids: indices des boids triés par cellule
+        cells: coordonnées de cellule (N, 2) de chaque boid
+        ncells_axe: nombre de cellules par axe de la grille
+        pred_x, pred_y: position du prédateur
+        out_dv: tableau (N, 2) de sortie
+    """
+    n = pos.shape[0]
+    for i in prange(n):
+        xi, yi = pos[i, 0], pos[i, 1]
+        vxi, vyi = vel[i, 0], vel[i, 1]
+        v1sq = vxi * vxi + vyi * vyi
+
+        # Sélection des MAX_VOISINS plus proches voisins visibles
+        # (comme Boid._accum_forces) : insertion bornée triée par d²
+        best_d2 = np.empty(MAX_VOISINS, dtype=np.float64)
+        best_j = np.empty(MAX_VOISINS, dtype=np.int64)
+        cnt = 0
+
+        cx, cy = cells[i, 0], cells[i, 1]
+        for dcx in range(-1, 2):
+            ccx = cx + dcx
+            if ccx < 0 or ccx >= ncells_axe:
+                continue
+            for dcy in range(-1, 2):
+                ccy = cy + dcy
+                if ccy < 0 or ccy >= ncells_axe:
+                    continue
+                c = ccx * ncells_axe + ccy
+                for k in range(cell_start[c], cell_start[c + 1]):
+                    j = boid_ids[k]
+                    if j == i:
+                        continue
+                    dx = pos[j, 0] - xi
+                    dy = pos[j, 1] - yi
+                    d2 = dx * dx + dy * dy
+                    if d2 >= 40000.0:  # 200²
+                        continue
+                    # Angle mort : cos(angle) < cos(0.75π), via le signe
+                    # du produit scalaire et les normes au carré
+                    dot = vxi * dx + vyi * dy
+                    if dot < 0.0 and dot * dot > _ANGLE_MORT_COS2 * v1sq * d2:
+                        continue
+                    if cnt < MAX_VOISINS:
+                        idx = cnt
+                        cnt += 1
+                    elif d2 < best_d2[MAX_VOISINS - 1]:
+                        idx = MAX_VOISINS - 1
+                    else:
+                        continue
+                    best_d2[idx] = d2
+                    best_j[idx] = j
+                    while idx > 0 and best_d2[idx] < best_d2[idx - 1]:
+                        best_d2[idx], best_d2[idx - 1] = (
+                            best_d2[idx - 1], best_d2[idx]
+                        )
+                        best_j[idx], best_j[idx - 1] = (
+                            best_j[idx - 1], best_j[idx]
+                        )
+                        idx -= 1
+
+        sep_x = 0.0
+        sep_y = 0.0
+        ali_x = 0.0
+        ali_y = 0.0
+        coh_x = 0.0
+        coh_y = 0.0
+        for t in range(cnt):
+            j = best_j[t]
+            dx = pos[j, 0] - xi
+            dy = pos[j, 1] - yi
+            if best_d2[t] < 2500.0:  # 50²
+                sep_x -= dx
+                sep_y -= dy
+            ali_x += vel[j, 0]
+            ali_y += vel[j, 1]
+            coh_x += dx
+            coh_y += dy
+
+        dvx = sep_x / 50.0
+        dvy = sep_y / 50.0
+        if cnt > 0:
+            dvx += (ali_x / cnt - vxi) / 8.0 + (coh_x / cnt) / 100.0
+            dvy += (ali_y / cnt - vyi) / 8.0 + (coh_y / cnt) / 100.0
+
+        # Fuite du prédateur (rayon 250, hors angle mort)
+        dx = xi - pred_x
+        dy = yi - pred_y
+        d2 = dx * dx + dy * dy
+        dot = -(vxi * dx + vyi * dy)
+        blind = dot < 0.0 and dot * dot > _ANGLE_MORT_COS2 * v1sq * d2
+        if d2 < 62500.0 and not blind:
+            dist = math.sqrt(d2)
+            force = 400.0 / max(dist, 10.0)
+            if dist > 0.0:
+                inv = 1.0 / dist
+                dvx += dx * inv * force / 2.0
+                dvy += dy * inv * force / 2.0
+
+        # Force centripète (poids 200)
+        dvx -= xi / 200.0
+        dvy -= yi / 200.0
+
+        out_dv[i, 0] = dvx
+        out_dv[i, 1] = dvy
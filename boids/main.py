@@ -3,7 +3,7 @@ Module principal pour lancer la simulation de boids.
 """
 
 import pygame
-from .boid import Boid
+from .boid import TAILLE
 from .simulation import Simulation
 
 def run_simulation():
@@ -18,7 +18,7 @@ def run_simulation():
     RED = (255, 0, 0)
 
     # Configurer l'affichage
-    screen_size = (Boid.taille * 2, Boid.taille * 2)
+    screen_size = (TAILLE * 2, TAILLE * 2)
     screen = pygame.display.set_mode(screen_size)
     pygame.display.set_caption('Boid Simulation')
 
@@ -29,10 +29,17 @@ def run_simulation():
     # Créer la simulation
     simulation = Simulation(n=30)
 
+    # Sprites pré-dessinés : les cercles ne sont tracés qu'une seule fois,
+    # le rendu se fait ensuite par blits (un seul appel C pour tout le lot)
+    boid_sprite = pygame.Surface((10, 10), pygame.SRCALPHA)
+    pygame.draw.circle(boid_sprite, BLUE, (5, 5), 5)
+    predator_sprite = pygame.Surface((16, 16), pygame.SRCALPHA)
+    pygame.draw.circle(predator_sprite, RED, (8, 8), 8)
+
     # Police pour le message de fin
     font = pygame.font.Font(None, 74)
     game_over_text = font.render("GAME OVER", True, (255, 0, 0))
-    game_over_rect = game_over_text.get_rect(center=(Boid.taille, Boid.taille))
+    game_over_rect = game_over_text.get_rect(center=(TAILLE, TAILLE))
 
     # Variable pour suivre si le jeu est terminé
     game_over = False
@@ -54,12 +61,14 @@ def run_simulation():
         if not game_over:
             simulation.iteration()
 
-        # Dessiner les boids
-        for boid in simulation.boids:
-            pygame.draw.circle(screen, BLUE, (int(boid.x[0] + Boid.taille), int(boid.x[1] + Boid.taille)), 5)
+        # Dessiner les boids : coordonnées écran calculées en un lot sur le
+        # tableau des positions, puis un unique blits du sprite
+        screen_pts = (simulation.pos[simulation.alive] + (TAILLE - 5)).astype(int)
+        screen.blits([(boid_sprite, pt) for pt in screen_pts.tolist()])
 
         # Dessiner le prédateur
-        pygame.draw.circle(screen, RED, (int(simulation.predator.x[0] + Boid.taille), int(simulation.predator.x[1] + Boid.taille)), 8)
+        screen.blit(predator_sprite, (int(simulation.predator.x[0] + TAILLE - 8),
+                                      int(simulation.predator.x[1] + TAILLE - 8)))
 
         # Afficher le message de fin si le jeu est terminé
         if game_over:
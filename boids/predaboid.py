@@ -11,55 +11,73 @@ class Predaboid(Boid):
     Classe représentant un prédateur de boids.
     Le predaboid chasse et mange les boids normaux.
     """
-    
-    def __init__(self, position=None, vitesse=None):
+
+    __slots__ = ("eating_range",)
+
+    def __init__(self, position=None, vitesse=None, rng=None):
         """
         Initialise un nouveau predaboid.
-        
+
         Args:
             position: position initiale (aléatoire si None)
             vitesse: vitesse initiale (aléatoire si None)
+            rng: générateur np.random.Generator pour les tirages
         """
-        super().__init__(position, vitesse)
+        super().__init__(position, vitesse, rng)
         self.eating_range = 20  # Rayon dans lequel le prédateur peut manger les boids
         self.boostValue: float = 1.2  # Vitesse de base plus élevée
 
-    def eat(self, population: list[Boid]) -> list[Boid]:
+    def eat(self, pos: np.ndarray, alive: np.ndarray) -> np.ndarray:
         """
         Mange les boids qui sont dans le rayon d'action du prédateur.
-        
+
+        Un seul masque vectorisé sur les positions, au lieu de reconstruire
+        une liste de boids à chaque image.
+
         Args:
-            population: liste de tous les boids
-            
+            pos: positions (N, 2) des boids
+            alive: masque (N,) des boids encore vivants
+
         Returns:
-            list[Boid]: liste des boids restants après que le prédateur ait mangé
+            np.ndarray: nouveau masque des boids vivants
         """
-        new_population = []
-        for boid in population:
-            if self.distance(boid) > self.eating_range:
-                new_population.append(boid)
-        return new_population
+        d2 = ((pos - self.x) ** 2).sum(axis=1)
+        return alive & (d2 > self.eating_range ** 2)
         
-    def flee_predator(self, population: list[Boid]):
+    def flee_predator(self, predateur):
         """
         Surcharge de la méthode flee_predator pour que le predaboid ne se fuie pas lui-même.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            predateur: couple (predaboid, distance) ou None, ignoré
+
         Returns:
             np.ndarray: vecteur nul (le predaboid ne fuit pas)
         """
         # Le predaboid ne fuit pas les autres predaboids
         return np.zeros(2)
-        
-    def separation(self, population: list[Boid]):
+
+    def _accum_forces(self, candidats):
+        """
+        Surcharge du parcours fusionné des forces : la composante de
+        séparation est annulée, le predaboid fonce dans le tas.
+
+        Args:
+            candidats: couples (distance, voisin) triés par distance
+
+        Returns:
+            tuple: vecteurs (séparation nulle, alignement, cohésion)
+        """
+        _, ali, coh = super()._accum_forces(candidats)
+        return np.zeros(2), ali, coh
+
+    def separation(self, voisins: list[Boid]):
         """
         Surcharge de la méthode separation pour que le predaboid n'utilise pas la force de séparation.
-        
+
         Args:
-            population: liste de tous les boids
-            
+            voisins: voisins proches déjà filtrés, ignorés
+
         Returns:
             np.ndarray: vecteur nul (pas de séparation)
         """
@@ -4,37 +4,497 @@ Module contenant la classe Simulation pour la simulation de boids.
 
 from __future__ import annotations
 import numpy as np
-from .boid import Boid, buildBoidCentripete
+from .boid import (
+    ANGLE_MORT_COS, MAX_BOOST, MAX_VITESSE, MAX_VOISINS, TAILLE, Boid,
+)
 from .predaboid import Predaboid
 
+try:
+    from .boids_kernel import compute_forces
+except ImportError:  # numba absent : repli sur le parcours NumPy
+    compute_forces = None
+
+try:
+    from scipy.spatial import cKDTree
+    from scipy.spatial.distance import pdist, squareform
+except ImportError:  # scipy absent : backend "kdtree" indisponible
+    cKDTree = None
+    pdist = None
+
+try:
+    import cupy as cp
+except ImportError:  # cupy absent : backend "cuda" indisponible
+    cp = None
+
+# En dessous de ce nombre de boids, la matrice condensée pdist (triangle
+# supérieur seulement) coûte moins cher que la construction d'une grille
+PETITE_POPULATION = 64
+
 class Simulation:
     """
     Classe gérant la simulation de boids et leur interaction avec un prédateur.
+
+    L'état des boids est stocké en "structure de tableaux" (SoA) : deux
+    tableaux (N, 2) ``pos`` et ``vel`` plutôt qu'une liste d'objets Boid.
+    La recherche de voisins passe par une grille spatiale uniforme dont la
+    maille vaut le plus grand rayon de requête, ce qui ramène le coût par
+    image de O(N²) à O(N·k) avec k le nombre de boids par cellule.
     """
-    
-    def __init__(self: Simulation, n: int, seed: int = 2042) -> None:
+
+    def __init__(self: Simulation, n: int, seed: int = 2042,
+                 cell_size: float = 250.0, backend: str | None = None,
+                 noise_poids: float | None = None) -> None:
         """
         Initialise une nouvelle simulation avec n boids et un prédateur.
-        
+
         Args:
             n: nombre de boids
             seed: graine pour la génération aléatoire
+            cell_size: maille de la grille spatiale (par défaut le plus
+                grand rayon utilisé : 250, la portée de fuite du prédateur)
+            backend: recherche de voisins, parmi "grid" (grille uniforme),
+                "kdtree" (scipy cKDTree, mieux adapté aux densités
+                irrégulières et aux grands N), "numba" (noyau JIT) et
+                "cuda" (forces calculées sur GPU via cupy, pour les très
+                grandes populations). Par défaut "numba" si disponible,
+                sinon "grid".
+            noise_poids: si renseigné, ajoute un comportement aléatoire de
+                poids donné (comme la fonction d'interaction noise), tiré
+                en un seul lot (N, 2) par image
+        """
+        if backend is None:
+            backend = "numba" if compute_forces is not None else "grid"
+        if backend not in ("grid", "kdtree", "numba", "cuda"):
+            raise ValueError(f"backend inconnu : {backend!r}")
+        if backend == "numba" and compute_forces is None:
+            raise ValueError("backend 'numba' demandé mais numba n'est pas installé")
+        if backend == "kdtree" and cKDTree is None:
+            raise ValueError("backend 'kdtree' demandé mais scipy n'est pas installé")
+        if backend == "cuda" and cp is None:
+            raise ValueError("backend 'cuda' demandé mais cupy n'est pas installé")
+        self.backend = backend
+
+        # Générateur local (PCG64) : plus rapide que l'API globale héritée
+        # et sans pollution de l'état aléatoire global
+        self.rng = np.random.default_rng(seed)
+        self.noise_poids = noise_poids
+
+        # Tableaux (N, 2) : positions et vitesses de tous les boids,
+        # tirés en un seul lot chacun. float32 suffit largement pour un
+        # cadre de ±300 et double le débit SIMD / la bande passante des
+        # passes par paires
+        self.pos = self.rng.uniform(-TAILLE, TAILLE, (n, 2)).astype(np.float32)
+        self.vel = self.rng.uniform(-5, 5, (n, 2)).astype(np.float32)
+        # Masque parallèle des boids encore vivants
+        self.alive = np.ones(n, dtype=bool)
+
+        # État du boost, par boid
+        self.boost = np.zeros(n, dtype=bool)
+        self.boost_value = np.full(n, MAX_BOOST, dtype=np.float32)
+
+        # Maille de la grille spatiale (réglable)
+        self.cell_size = cell_size
+
+        # Tampon de bruit préalloué, rempli en place à chaque image
+        self._noise_buf: np.ndarray | None = None
+
+        self.predator = Predaboid(rng=self.rng)  # Ajouter un predaboid
+
+        # Vues Boid légères sur les lignes de pos/vel (pour l'affichage
+        # et pour le prédateur qui garde l'interface objet)
+        self._rebuild_views()
+
+    def _rebuild_views(self: Simulation) -> None:
+        """Reconstruit les objets Boid vues après un changement de tableaux."""
+        self._views = [
+            Boid(position=self.pos[i], vitesse=self.vel[i])
+            for i in range(len(self.pos))
+        ]
+        self._boids_cache: list[Boid] | None = None
+
+    @property
+    def boids(self: Simulation) -> list[Boid]:
+        """
+        Liste des boids vivants, sous forme de vues légères sur pos/vel.
+
+        La liste est préconstruite et réutilisée d'un appel à l'autre ;
+        elle n'est reconstruite que lorsque le prédateur mange un boid,
+        au lieu d'allouer une liste neuve à chaque accès.
+        """
+        if self._boids_cache is None:
+            self._boids_cache = [v for v, a in zip(self._views, self.alive) if a]
+        return self._boids_cache
+
+    def voisins(self: Simulation, i: int, seuil: float) -> np.ndarray:
+        """
+        Renvoie les indices des boids à distance < seuil du boid i.
+
+        Ne balaie que les 9 cellules entourant celle du boid i, puis
+        filtre par distance au carré sur la tranche candidate. Les
+        tombstones (boids mangés, pas encore compactés) sont exclus.
+
+        Args:
+            i: indice du boid dans pos/vel
+            seuil: distance maximale de voisinage
+
+        Returns:
+            np.ndarray: indices des voisins vivants (le boid i exclu)
+        """
+        self._build_csr(self.pos)
+        cand = self._candidats(i)
+        cand = cand[self.alive[cand]]
+        delta = self.pos[cand] - self.pos[i]
+        d2 = (delta * delta).sum(1)
+        return cand[d2 < seuil * seuil]
+
+    def _candidats(self: Simulation, i: int) -> np.ndarray:
+        """Indices candidats des 9 cellules autour du boid i (i exclu)."""
+        cells, boid_ids, cell_start, ncells_axe = self._csr
+        cx, cy = cells[i]
+        morceaux = []
+        for dcx in (-1, 0, 1):
+            ccx = cx + dcx
+            if not 0 <= ccx < ncells_axe:
+                continue
+            for dcy in (-1, 0, 1):
+                ccy = cy + dcy
+                if not 0 <= ccy < ncells_axe:
+                    continue
+                c = ccx * ncells_axe + ccy
+                morceaux.append(boid_ids[cell_start[c]:cell_start[c + 1]])
+        if not morceaux:
+            return np.empty(0, dtype=np.int64)
+        cand = np.concatenate(morceaux)
+        return cand[cand != i]
+
+    def _build_csr(self: Simulation, pos: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        Aplati la grille spatiale au format CSR pour le noyau Numba.
+
+        Args:
+            pos: positions (N, 2) à indexer
+
+        Returns:
+            tuple: (cells (N, 2), boid_ids triés par cellule,
+                cell_start (ncells + 1), nombre de cellules par axe)
+        """
+        taille = TAILLE
+        ncells_axe = int(2 * taille // self.cell_size) + 1
+        cells = np.clip(
+            ((pos + taille) // self.cell_size).astype(np.int64),
+            0, ncells_axe - 1,
+        )
+        cell_id = cells[:, 0] * ncells_axe + cells[:, 1]
+        boid_ids = np.argsort(cell_id, kind="stable").astype(np.int64)
+        cell_start = np.searchsorted(
+            cell_id[boid_ids], np.arange(ncells_axe * ncells_axe + 1)
+        ).astype(np.int64)
+        self._csr = (cells, boid_ids, cell_start, ncells_axe)
+        return self._csr
+
+    def _forces(self: Simulation, pos: np.ndarray, vel: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcule la variation de vitesse de chaque boid pour une image.
+
+        Args:
+            pos: positions (N, 2) des boids vivants
+            vel: vitesses (N, 2) des boids vivants
+
+        Returns:
+            tuple: (dv de forme (N, 2), distances au prédateur de forme (N,),
+                masque (N,) des boids qui voient le prédateur)
+        """
+        dp = pos - self.predator.x
+        pred_dist = np.sqrt((dp * dp).sum(1))
+
+        # Visibilité du prédateur : même test de cosinus signé que pour
+        # les voisins (un prédateur derrière le boid n'est pas vu), calculé
+        # une fois pour la fuite et la détection du boost
+        dots = -(vel * dp).sum(1)
+        v2 = (vel * vel).sum(1)
+        pred_visible = (dots >= 0) | (
+            dots * dots
+            <= ANGLE_MORT_COS * ANGLE_MORT_COS * v2 * pred_dist * pred_dist
+        )
+
+        if self.backend == "cuda":
+            return self._forces_cuda(pos, vel), pred_dist, pred_visible
+
+        if self.backend == "numba":
+            cells, boid_ids, cell_start, ncells_axe = self._build_csr(pos)
+            dv = np.empty_like(vel)
+            compute_forces(
+                pos, vel, cell_start, boid_ids, cells,
+                ncells_axe, self.predator.x[0], self.predator.x[1], dv,
+            )
+            return dv, pred_dist, pred_visible
+
+        n = len(pos)
+        dv = np.zeros_like(vel)
+
+        d2_all = None
+        if pdist is not None and n <= PETITE_POPULATION:
+            # Petite population : distances de toutes les paires en une
+            # passe C sur le triangle supérieur seulement (chaque d²
+            # n'est calculé qu'une fois, d_ji = d_ij)
+            d2_all = squareform(pdist(pos, "sqeuclidean"))
+            np.fill_diagonal(d2_all, np.inf)
+            voisinages = (np.nonzero(ligne < 40000)[0] for ligne in d2_all)
+        elif self.backend == "kdtree":
+            # Toutes les listes de voisins en un appel C : build O(N log N),
+            # requêtes O(log N + k). Le rayon de vol (200) suffit : la
+            # fuite du prédateur est diffusée à part
+            tree = cKDTree(pos)
+            voisinages = tree.query_ball_tree(tree, 200)
+        else:
+            self._build_csr(pos)
+            voisinages = (self._candidats(i) for i in range(n))
+
+        for i, cand in enumerate(voisinages):
+            cand = np.asarray(cand, dtype=np.int64)
+            cand = cand[cand != i]  # le kdtree renvoie aussi le boid lui-même
+            if len(cand) > 0:
+                if d2_all is not None:
+                    d2 = d2_all[i, cand]
+                else:
+                    delta = pos[i] - pos[cand]
+                    d2 = (delta * delta).sum(1)
+
+                # Angle mort en lot : un produit matrice-vecteur pour les
+                # k candidats au lieu de k tests Python. Comparaison de
+                # cosinus signée sur les carrés, jamais d'arccos ni de
+                # clamp (mort avec la forme branchless)
+                dots = pos[cand] @ vel[i] - pos[i] @ vel[i]
+                v2 = vel[i] @ vel[i]
+                visibles = (dots >= 0) | (
+                    dots * dots <= ANGLE_MORT_COS * ANGLE_MORT_COS * v2 * d2
+                )
+                cand = cand[visibles]
+                d2 = d2[visibles]
+
+                # Rayon de vol (200), puis plafond aux MAX_VOISINS plus
+                # proches comme dans Boid._accum_forces
+                dans_rayon = d2 < 40000
+                cand = cand[dans_rayon]
+                d2 = d2[dans_rayon]
+                if len(cand) > MAX_VOISINS:
+                    keep = np.argpartition(d2, MAX_VOISINS)[:MAX_VOISINS]
+                    cand = cand[keep]
+                    d2 = d2[keep]
+                if len(cand) == 0:
+                    continue
+
+                # Séparation : somme des écarts aux voisins proches (50)
+                proches = cand[d2 < 2500]
+                if len(proches) > 0:
+                    dv[i] += (pos[i] - pos[proches]).sum(0) / 50
+
+                # Alignement et cohésion : moyennes sur les voisins retenus
+                dv[i] += (vel[cand].mean(0) - vel[i]) / 8
+                dv[i] += (pos[cand].mean(0) - pos[i]) / 100
+
+        # Fuite du prédateur : direction normalisée Δ/d et force
+        # 400/max(d,10) fusionnées en un seul coefficient, comme dans
+        # Boid.flee_predator et le noyau Numba (norme plafonnée à 40 en
+        # dessous de 10, pas affaiblie). Même angle mort que pour les
+        # voisins : un prédateur derrière le boid n'est pas vu
+        coeff = (
+            400 / (np.maximum(pred_dist, 1e-12) * np.maximum(pred_dist, 10))
+            * ((pred_dist < 250) & pred_visible) / 2
+        )
+        dv += dp * coeff[:, None]
+
+        # Force centripète (poids 200)
+        dv -= pos / 200
+
+        return dv, pred_dist, pred_visible
+
+    def _forces_cuda(self: Simulation, pos_h: np.ndarray, vel_h: np.ndarray) -> np.ndarray:
+        """
+        Calcule les forces sur GPU (cupy) par diffusion sur toutes les paires.
+
+        Le parallélisme par paire est trivial : des milliers de threads CUDA
+        absorbent le O(N²) bien au-delà de ce que supportent les parcours
+        CPU. L'état reste côté hôte, seuls pos/vel transitent par image ;
+        pour les très grands N le coût du calcul domine largement les
+        transferts.
+
+        Args:
+            pos_h: positions (N, 2) des boids vivants, côté hôte
+            vel_h: vitesses (N, 2) des boids vivants, côté hôte
+
+        Returns:
+            np.ndarray: dv de forme (N, 2), rapatrié côté hôte
+        """
+        pos = cp.asarray(pos_h)
+        vel = cp.asarray(vel_h)
+
+        d = pos[:, None, :] - pos[None, :, :]
+        dist2 = (d * d).sum(-1)
+        # Exclut la diagonale (le boid lui-même)
+        cp.fill_diagonal(dist2, cp.inf)
+
+        # Angle mort en lot : einsum fusionné sur toutes les paires,
+        # comparaison de cosinus signée sans arccos
+        dots = -cp.einsum('ijk,ik->ij', d, vel)
+        v2 = (vel * vel).sum(1)[:, None]
+        blind = (dots < 0) & (
+            dots * dots > ANGLE_MORT_COS * ANGLE_MORT_COS * v2 * dist2
+        )
+
+        vois_mask = (dist2 < 40000) & ~blind
+        # Plafond aux MAX_VOISINS plus proches par boid, comme les autres
+        # parcours : seuil au k-ième plus petit d² parmi les visibles
+        if dist2.shape[1] > MAX_VOISINS:
+            bornes = cp.partition(
+                cp.where(vois_mask, dist2, cp.inf), MAX_VOISINS - 1, axis=1
+            )[:, MAX_VOISINS - 1:MAX_VOISINS]
+            vois_mask &= dist2 <= bornes
+        sep_mask = vois_mask & (dist2 < 2500)
+
+        # Séparation : somme des écarts aux voisins proches
+        dv = (d * sep_mask[..., None]).sum(1) / 50
+
+        # Alignement et cohésion : moyennes sur les voisins visibles
+        cnt = vois_mask.sum(1, keepdims=True)
+        safe_cnt = cp.maximum(cnt, 1)
+        align = (vel[None, :, :] * vois_mask[..., None]).sum(1) / safe_cnt
+        dv += cp.where(cnt > 0, align - vel, 0.0) / 8
+        cohere = (pos[None, :, :] * vois_mask[..., None]).sum(1) / safe_cnt
+        dv += cp.where(cnt > 0, cohere - pos, 0.0) / 100
+
+        # Fuite du prédateur : même coefficient fusionné 400/(d·max(d,10))
+        # et même angle mort que les parcours CPU (le prédateur derrière
+        # le boid n'est pas vu)
+        dp = pos - cp.asarray(self.predator.x)
+        pd2 = (dp * dp).sum(1)
+        dot_p = -(vel * dp).sum(1)
+        blind_p = (dot_p < 0) & (
+            dot_p * dot_p > ANGLE_MORT_COS * ANGLE_MORT_COS * v2[:, 0] * pd2
+        )
+        pd = cp.sqrt(pd2)
+        coeff = (
+            400 / (cp.maximum(pd, 1e-12) * cp.maximum(pd, 10))
+            * ((pd < 250) & ~blind_p) / 2
+        )
+        dv += dp * coeff[:, None]
+
+        # Force centripète (poids 200)
+        dv -= pos / 200
+
+        return cp.asnumpy(dv).astype(np.float32)
+
+    def _bruit(self: Simulation, n: int) -> np.ndarray | None:
+        """
+        Tire le bruit de toute la population en un seul lot (n, 2).
+
+        Le tampon est préalloué et rempli en place : aucune allocation
+        par image tant que la population ne change pas de taille.
         """
-        np.random.seed(seed)
+        if self.noise_poids is None:
+            return None
+        buf = self._noise_buf
+        if buf is None or len(buf) != n:
+            buf = self._noise_buf = np.empty((n, 2), dtype=np.float32)
+        # uniforme sur [0, 1) en place, puis mise à l'échelle sur
+        # [-5, 5) / poids sans tableau intermédiaire
+        self.rng.random(out=buf, dtype=np.float32)
+        buf *= 10 / self.noise_poids
+        buf -= 5 / self.noise_poids
+        return buf
 
-        self.boids = list(buildBoidCentripete() for _ in range(n))
-        self.predator = Predaboid()  # Ajouter un predaboid
+    def _compact(self: Simulation) -> None:
+        """Élimine les lignes mortes des tableaux (compactage des tombstones)."""
+        vivants = self.alive
+        self.pos = self.pos[vivants]
+        self.vel = self.vel[vivants]
+        self.boost = self.boost[vivants]
+        self.boost_value = self.boost_value[vivants]
+        self.alive = np.ones(len(self.pos), dtype=bool)
+        self._rebuild_views()
 
     def iteration(self: Simulation):
         """
         Effectue une itération de la simulation.
         """
-        # Optimisation: éviter de créer une nouvelle liste à chaque itération
-        for boid in self.boids:
-            boid.interaction(self.boids + [self.predator])
-        
-        # Predator eats boids
-        self.boids = self.predator.eat(self.boids)
-        
+        # Les boids mangés restent en place comme tombstones : la mise à
+        # jour ne travaille que sur le sous-ensemble vivant, rassemblé au
+        # besoin, et les écritures repartent dans les tableaux d'origine
+        # pour que les vues restent valides
+        if self.alive.all():
+            idx = None
+            pos, vel = self.pos, self.vel
+            boost, boost_value = self.boost, self.boost_value
+        else:
+            idx = np.nonzero(self.alive)[0]
+            pos, vel = self.pos[idx], self.vel[idx]
+            boost, boost_value = self.boost[idx], self.boost_value[idx]
+
+        n = len(pos)
+        if n > 0:
+            dv, pred_dist, pred_visible = self._forces(pos, vel)
+            if (bruit := self._bruit(n)) is not None:
+                dv += bruit
+            vel += dv
+
+            # Active le boost uniquement si le predaboid est détecté,
+            # c'est-à-dire à portée ET hors de l'angle mort, comme dans
+            # le parcours objet
+            detected = (pred_dist < 150) & pred_visible
+            boost = detected & (boost_value > 1)
+
+            # Limite de la vitesse : comparaison sur le carré, la racine
+            # n'est prise que pour les boids effectivement trop rapides
+            vitesse2 = (vel * vel).sum(1)
+            trop_vite = vitesse2 > MAX_VITESSE ** 2
+            if trop_vite.any():
+                vel[trop_vite] *= (
+                    MAX_VITESSE / np.sqrt(vitesse2[trop_vite])
+                )[:, None]
+
+            # On avance (le boost module la longueur du pas)
+            pos += vel * boost_value[:, None]
+
+            # Dynamique du boost, comme dans Boid.move
+            boost_value[boost] -= 0.5
+            epuise = boost & (boost_value <= 1)
+            boost_value[epuise] = 0
+            boost[epuise] = False
+            recharge = ~boost & (boost_value < MAX_BOOST)
+            boost_value[recharge] = np.minimum(
+                boost_value[recharge] + 0.01, MAX_BOOST
+            )
+
+            # On veille à rester dans le cadre par effet rebond, en une
+            # seule passe vectorielle : réflexion de la vitesse et de la
+            # position autour de la marge intérieure (taille - 10)
+            marge = TAILLE - 10
+            dehors = np.abs(pos) > marge
+            np.negative(vel, where=dehors, out=vel)
+            np.copyto(
+                pos,
+                np.clip(2 * np.sign(pos) * marge - pos, -marge, marge),
+                where=dehors,
+            )
+
+            # Retour des copies rassemblées dans les tableaux d'origine
+            if idx is None:
+                self.boost = boost
+            else:
+                self.pos[idx] = pos
+                self.vel[idx] = vel
+                self.boost[idx] = boost
+                self.boost_value[idx] = boost_value
+
+            # Predator eats boids : simple masque vectorisé
+            alive = self.predator.eat(self.pos, self.alive)
+            if not (alive == self.alive).all():
+                self.alive = alive
+                self._boids_cache = None
+                # Compactage seulement quand les tombstones dominent,
+                # pour éviter une réallocation à chaque repas
+                if 2 * alive.sum() < len(alive):
+                    self._compact()
+
         # Le predaboid n'interagit qu'avec les boids normaux, pas avec lui-même
         self.predator.interaction(self.boids)
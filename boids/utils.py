@@ -3,29 +3,61 @@ Fonctions utilitaires pour la simulation de boids.
 """
 
 from __future__ import annotations
+import functools
+from typing import NamedTuple
 import numpy as np
-from matplotlib import path
 
-# Forme du boid utilisant path.Path
-boid_shape = path.Path(
+class Shape(NamedTuple):
+    """
+    Forme 2D : sommets et codes de tracé.
+
+    Simple conteneur (vertices, codes) remplaçant matplotlib.path.Path,
+    dont seul ce rôle de conteneur était utilisé : le rendu passe par
+    pygame, importer matplotlib ne servait qu'à porter deux tableaux.
+    """
+    vertices: np.ndarray
+    codes: np.ndarray
+
+# Forme du boid
+boid_shape = Shape(
     # coordonnées du schéma, orienté vers la droite
     vertices=np.array([[0, 0], [-100, 100], [200, 0], [-100, -100], [0, 0]]),
     # 1: moveto, 2: lineto, 79: closepoly
-    # https://matplotlib.org/stable/api/path_api.html#matplotlib.path.Path
+    # (mêmes conventions que matplotlib.path.Path)
     codes=np.array([1, 2, 2, 2, 79], dtype=np.uint8),
 )
 
-def pathRotate(p: path.Path, angle: float) -> path.Path:
+def _rotate(p: Shape, angle: float) -> Shape:
+    """Construit une nouvelle Shape tournée de l'angle donné."""
+    cos, sin = np.cos(angle), np.sin(angle)
+    v = p.vertices
+    # Rotation écrite colonne par colonne : pas de matrice 2x2 allouée
+    # ni de produit matriciel, juste quatre produits scalaire-vecteur
+    newpath = np.empty_like(v, dtype=float)
+    newpath[:, 0] = v[:, 0] * cos - v[:, 1] * sin
+    newpath[:, 1] = v[:, 0] * sin + v[:, 1] * cos
+    return Shape(newpath, p.codes)
+
+@functools.lru_cache(maxsize=512)
+def _rotate_boid_shape(angle_mrad: int) -> Shape:
+    """Rotation mémoïsée de boid_shape, par angle arrondi au milliradian."""
+    return _rotate(boid_shape, angle_mrad / 1000)
+
+def pathRotate(p: Shape, angle: float) -> Shape:
     """
-    Rotation d'un path.Path selon un angle donné.
+    Rotation d'une Shape selon un angle donné.
+
+    Pour la forme standard du boid, le résultat est mémoïsé par angle
+    discrétisé au milliradian (invisible à l'écran), ce qui évite de
+    reconstruire la rotation à chaque boid et chaque image.
 
     Args:
-        p: path.Path
+        p: Shape (sommets, codes)
         angle: angle en radians
 
     Returns:
-        path.Path : nouveau path.Path après rotation
+        Shape : nouvelle Shape après rotation
     """
-    cos, sin = np.cos(angle), np.sin(angle)
-    newpath = p.vertices @ (np.array([[cos, sin], [-sin, cos]]))
-    return path.Path(newpath, p.codes)
+    if p is boid_shape:
+        return _rotate_boid_shape(int(angle * 1000))
+    return _rotate(p, angle)